@@ -1,12 +1,13 @@
 # app.py
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
 from music import get_track_preview, initialize_spotify_client, create_spotify_embed
-import base64
+import io
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Page configuration
 st.set_page_config(
@@ -17,20 +18,140 @@ st.set_page_config(
 )
 
 # Load custom CSS
+@st.cache_data(max_entries=4)
+def _read_css(path: str, mtime: float) -> str:
+    """Read the stylesheet; mtime is part of the cache key so edits invalidate it"""
+    return Path(path).read_text()
+
 def load_css():
     """Load custom CSS styling"""
     css_file = Path("style.css")
     if css_file.exists():
-        with open(css_file) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+        css = _read_css(str(css_file), css_file.stat().st_mtime)
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
     else:
         st.warning("style.css not found")
 
+# Cached dataset loaders (parsed once, reused across reruns)
+def _categorize(df):
+    """Store repeated text columns as ordered categoricals (sorted, unique categories)"""
+    for col in ('artist', 'track_name', 'album'):
+        if col in df.columns:
+            df[col] = df[col].astype(pd.CategoricalDtype(ordered=True))
+    return df
+
+def _read_csv(source):
+    """Parse a CSV with the multithreaded pyarrow engine, falling back to the default one"""
+    try:
+        return pd.read_csv(source, engine='pyarrow', dtype_backend='pyarrow')
+    except (ImportError, ValueError, pd.errors.ParserError):
+        # pyarrow is stricter (e.g. short rows); the C engine pads them with NaN
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return pd.read_csv(source)
+
+# No spinner: it would be drawn from the warm-up thread
+@st.cache_data(ttl="24h", max_entries=8, show_spinner=False)
+def load_csv(path):
+    """Load a CSV dataset from disk, via a Parquet copy written on first load"""
+    csv_file = Path(path)
+    pq_file = csv_file.with_suffix('.parquet')
+    if pq_file.exists() and (not csv_file.exists() or pq_file.stat().st_mtime >= csv_file.stat().st_mtime):
+        try:
+            return _categorize(pd.read_parquet(pq_file))
+        except Exception:
+            # Corrupt or unreadable copy: parse the CSV and rewrite it
+            if not csv_file.exists():
+                raise
+    df = _read_csv(csv_file)
+    tmp_file = None
+    try:
+        # Write to a temporary file and swap it in, so concurrent loaders never see a partial file
+        fd, tmp_file = tempfile.mkstemp(prefix=f'.{pq_file.stem}.', suffix='.parquet', dir=pq_file.parent)
+        os.close(fd)
+        df.to_parquet(tmp_file, compression='zstd')
+        os.replace(tmp_file, pq_file)
+        tmp_file = None
+    except Exception:
+        # The Parquet copy is only a cache (no engine, read-only directory,
+        # mixed-type columns pyarrow can't store): keep serving the CSV
+        pass
+    finally:
+        if tmp_file and os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return _categorize(df)
+
+@st.cache_data(ttl="24h", max_entries=8)
+def load_csv_bytes(uploaded_bytes: bytes):
+    """Load an uploaded CSV dataset, keyed on its raw bytes"""
+    return _categorize(_read_csv(io.BytesIO(uploaded_bytes)))
+
+@st.cache_data(ttl="24h", max_entries=8)
+def build_artist_index(_df: pd.DataFrame, key):
+    """Map each artist (sorted) to a sorted tuple of their track names
+    
+    The frame itself isn't hashed; key (the dataset's source) identifies it
+    """
+    # One sort over the distinct (artist, track) pairs; on the ordered categorical
+    # columns both dedup and sort work on integer codes rather than strings
+    pairs = (_df[['artist', 'track_name']].dropna().drop_duplicates()
+             .sort_values(['artist', 'track_name']))
+    g = pairs.groupby('artist', sort=False, observed=True)['track_name']
+    return {a: tuple(v) for a, v in g}
+
+@st.cache_data(ttl="24h", max_entries=8)
+def dataset_preview(_df: pd.DataFrame, key, n: int = 20):
+    """First n rows converted to an Arrow table once, keyed on the dataset's source"""
+    import pyarrow as pa
+    return pa.Table.from_pandas(_df.head(n), preserve_index=False)
+
+def _n_unique(col: pd.Series) -> int:
+    """Distinct values; a categories lookup for categorical columns"""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        return col.cat.categories.size
+    return col.nunique()
+
+@st.cache_data(ttl="24h", max_entries=8)
+def dataset_stats(_df: pd.DataFrame, key):
+    """Summary statistics shown in the Dataset Statistics section, keyed on the dataset's source"""
+    return {
+        'n': len(_df),
+        'artists': _n_unique(_df['artist']),
+        'pop': float(_df['popularity'].mean()) if 'popularity' in _df.columns else None,
+        'albums': _n_unique(_df['album']) if 'album' in _df.columns else None
+    }
+
+def _warm_spotify_token():
+    """Create the Spotify client and fetch its access token ahead of the first lookup"""
+    # music.py caches the client, so lookups reuse this token
+    sp = initialize_spotify_client()
+    if sp is not None:
+        sp.auth_manager.get_access_token(as_dict=False)
+
+def warm_caches():
+    """Parse the default dataset while the Spotify access token is fetched"""
+    ctx = get_script_run_ctx()
+    
+    def run(fn, *args):
+        add_script_run_ctx(ctx=ctx)
+        return fn(*args)
+    
+    # Errors are left to resurface (and be reported) at first use
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        ex.submit(run, load_csv, 'songs.csv')
+        ex.submit(run, _warm_spotify_token)
+
+# Overlap the CSV parse with the token request on a session's first run
+if 'df' not in st.session_state:
+    warm_caches()
+
 load_css()
 
 # Initialize session state
 if 'df' not in st.session_state:
     st.session_state.df = None
+    # Identifies the loaded dataset for the caches derived from it
+    st.session_state.df_key = None
 if 'selected_track' not in st.session_state:
     st.session_state.selected_track = None
 
@@ -56,7 +177,8 @@ with col2:
 
 if uploaded_file is not None:
     try:
-        st.session_state.df = pd.read_csv(uploaded_file)
+        st.session_state.df = load_csv_bytes(uploaded_file.getvalue())
+        st.session_state.df_key = uploaded_file.file_id
         st.success(f"✅ Dataset loaded successfully! ({len(st.session_state.df)} tracks)")
     except Exception as e:
         st.error(f"❌ Error loading file: {e}")
@@ -64,22 +186,146 @@ if uploaded_file is not None:
 # Load default dataset if no file uploaded
 if st.session_state.df is None:
     try:
-        st.session_state.df = pd.read_csv('songs.csv')
+        st.session_state.df = load_csv('songs.csv')
+        st.session_state.df_key = 'songs.csv'
         st.info("ℹ️ Using default dataset (songs.csv)")
     except:
         st.warning("⚠️ No dataset available. Please upload a CSV file.")
 
-# Main analysis section
-if st.session_state.df is not None:
-    df = st.session_state.df
+# Audio features shown in the cards; the charts use all but the trailing Tempo
+FEATURE_KEYS = ('danceability', 'energy', 'speechiness', 'acousticness',
+                'instrumentalness', 'liveness', 'valence', 'tempo')
+FEATURE_LABELS = ('Danceability', 'Energy', 'Speechiness', 'Acousticness',
+                  'Instrumentalness', 'Liveness', 'Valence', 'Tempo')
+FEATURE_ICONS = ('💃', '⚡', '🗣️', '🎸', '🎹', '🎤', '😊', '🥁')
+
+@st.cache_data(max_entries=128)
+def build_figs(track_id: str, values: tuple):
+    """Build the bar and radar figures for a track, returned as Plotly JSON
+    
+    values follows FEATURE_KEYS order; Tempo (the last one) is drawn by tempo_gauge
+    """
+    import plotly.graph_objects as go
+    
+    feature_names = list(FEATURE_LABELS[:-1])
+    feature_values = list(values[:-1])
+    
+    fig_bar = go.Figure(data=[
+        go.Bar(
+            x=feature_names,
+            y=feature_values,
+            marker=dict(
+                color=feature_values,
+                colorscale=[[0, '#0a4d2e'], [0.5, '#1DB954'], [1, '#1ed760']],
+                line=dict(color='#1DB954', width=2)
+            ),
+            text=[f'{v:.1f}%' for v in feature_values],
+            textposition='outside',
+            textfont=dict(color='white', size=14, family='Poppins')
+        )
+    ])
+    
+    fig_bar.update_layout(
+        plot_bgcolor='rgba(10, 14, 39, 0.5)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white', family='Poppins'),
+        yaxis=dict(
+            range=[0, 110], 
+            title=dict(text='Percentage (%)', font=dict(size=14)),
+            gridcolor='rgba(255,255,255,0.1)',
+            tickfont=dict(size=12)
+        ),
+        xaxis=dict(
+            title=dict(text='', font=dict(size=14)),
+            tickfont=dict(size=12)
+        ),
+        height=450,
+        margin=dict(t=40, b=60, l=60, r=40),
+        showlegend=False
+    )
+    
+    fig_radar = go.Figure()
+    
+    fig_radar.add_trace(go.Scatterpolar(
+        r=feature_values,
+        theta=feature_names,
+        fill='toself',
+        fillcolor='rgba(29, 185, 84, 0.4)',
+        line=dict(color='#1DB954', width=3),
+        name='Audio Features',
+        marker=dict(size=8, color='#1ed760')
+    ))
+    
+    fig_radar.update_layout(
+        polar=dict(
+            bgcolor='rgba(10, 14, 39, 0.5)',
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100],
+                gridcolor='rgba(255,255,255,0.2)',
+                tickfont=dict(color='white', size=11, family='Poppins'),
+                ticksuffix='%'
+            ),
+            angularaxis=dict(
+                gridcolor='rgba(255,255,255,0.2)',
+                tickfont=dict(color='white', size=12, family='Poppins', weight='bold')
+            )
+        ),
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white', family='Poppins'),
+        height=450,
+        margin=dict(t=60, b=60, l=60, r=60),
+        showlegend=False
+    )
     
+    return fig_bar.to_json(), fig_radar.to_json()
+
+# Tempo gauge: a 270 degree arc over 0-200 BPM, filled via stroke-dasharray
+TEMPO_GAUGE_SVG = """<div style="text-align: center;">
+<svg viewBox="0 0 300 280" width="100%" height="450" xmlns="http://www.w3.org/2000/svg" font-family="Poppins">
+<text x="150" y="24" text-anchor="middle" fill="white" font-size="20">Beats Per Minute</text>
+<path d="M 72.22 237.78 A 110 110 0 1 1 227.78 237.78" fill="none" stroke="rgba(29, 185, 84, 0.2)" stroke-width="24"/>
+<path d="M 72.22 237.78 A 110 110 0 1 1 227.78 237.78" fill="none" stroke="#1DB954" stroke-width="24" pathLength="100" stroke-dasharray="{pct:.2f} 100"/>
+<line x1="150" y1="160" x2="150" y2="65" stroke="#1ed760" stroke-width="5" stroke-linecap="round" transform="rotate({angle:.2f} 150 160)"/>
+<circle cx="150" cy="160" r="8" fill="#1ed760"/>
+<text x="150" y="230" text-anchor="middle" fill="#1DB954" font-size="40" font-weight="bold">{tempo:.0f} BPM</text>
+<text x="72" y="270" text-anchor="middle" fill="white" font-size="12">0</text>
+<text x="228" y="270" text-anchor="middle" fill="white" font-size="12">200</text>
+</svg>
+</div>"""
+
+def tempo_gauge(tempo):
+    """Tempo gauge markup for a BPM value"""
+    pct = min(max(tempo, 0), 200) / 200 * 100
+    return TEMPO_GAUGE_SVG.format(pct=pct, angle=pct / 100 * 270 - 135, tempo=tempo)
+
+def listen_link(url, gradient, shadow_rgb, icon, label):
+    """Styled anchor for the Listen to Full Track row"""
+    return (
+        f'<a href="{url}" target="_blank" '
+        f'style="flex: 1; display: block; background: linear-gradient(135deg, {gradient}); '
+        f'color: white; text-decoration: none; padding: 1rem; border-radius: 12px; '
+        f'text-align: center; font-weight: 600; transition: transform 0.2s; '
+        f'box-shadow: 0 4px 15px rgba({shadow_rgb}, 0.3);" '
+        f'onmouseover="this.style.transform=\'translateY(-3px)\'" '
+        f'onmouseout="this.style.transform=\'translateY(0)\'">'
+        f'<div style="font-size: 2rem; margin-bottom: 0.5rem;">{icon}</div>'
+        f'<div>{label}</div>'
+        f'</a>'
+    )
+
+# Track selection and analysis panel
+@st.fragment
+def track_panel(df, df_key):
+    """Track selection, analysis and charts; reruns on its own widget changes"""
     # Selection section
     st.markdown('<div class="section-divider"><span>🎧 Select Track</span></div>', unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
+    idx = build_artist_index(df, df_key)
     
     with col1:
-        artists = sorted(df['artist'].unique())
+        artists = df['artist'].cat.categories.tolist()
         selected_artist = st.selectbox(
             "Choose Artist",
             options=artists,
@@ -87,10 +333,10 @@ if st.session_state.df is not None:
         )
     
     with col2:
-        artist_songs = df[df['artist'] == selected_artist]['track_name'].unique()
+        artist_songs = idx.get(selected_artist, ())
         selected_song = st.selectbox(
             "Choose Song",
-            options=sorted(artist_songs),
+            options=artist_songs,
             key="song_select"
         )
     
@@ -119,34 +365,34 @@ if st.session_state.df is not None:
         col1, col2 = st.columns([1, 2])
         
         with col1:
-            if track.get('album_image'):
+            if track.album_image:
                 st.markdown(f"""
                     <div class="album-card">
-                        <img src="{track['album_image']}" class="album-image">
+                        <img src="{track.album_image}" class="album-image">
                     </div>
                 """, unsafe_allow_html=True)
         
         with col2:
             st.markdown(f"""
                 <div class="info-card">
-                    <h2 class="track-title">{track['name']}</h2>
-                    <p class="track-artist">by {track['artist']}</p>
+                    <h2 class="track-title">{track.name}</h2>
+                    <p class="track-artist">by {track.artist}</p>
                     <div class="track-details">
                         <div class="detail-item">
                             <span class="detail-label">Album:</span>
-                            <span class="detail-value">{track['album']}</span>
+                            <span class="detail-value">{track.album}</span>
                         </div>
                         <div class="detail-item">
                             <span class="detail-label">Release Date:</span>
-                            <span class="detail-value">{track['release_date']}</span>
+                            <span class="detail-value">{track.release_date}</span>
                         </div>
                         <div class="detail-item">
                             <span class="detail-label">Popularity:</span>
-                            <span class="detail-value">{track['popularity']}/100</span>
+                            <span class="detail-value">{track.popularity}/100</span>
                         </div>
                         <div class="detail-item">
                             <span class="detail-label">Duration:</span>
-                            <span class="detail-value">{track['duration_ms'] // 60000}:{(track['duration_ms'] // 1000) % 60:02d}</span>
+                            <span class="detail-value">{track.duration_ms // 60000}:{(track.duration_ms // 1000) % 60:02d}</span>
                         </div>
                     </div>
                 </div>
@@ -155,7 +401,7 @@ if st.session_state.df is not None:
         # Audio player - 30 second preview with styled player
         st.markdown('<div class="section-divider"><span>▶️ Music Player</span></div>', unsafe_allow_html=True)
         
-        if track.get('preview_url'):
+        if track.preview_url:
             # Custom styled 30-second preview player
             player_html = f"""
             <div style="background: linear-gradient(135deg, rgba(29, 185, 84, 0.15) 0%, rgba(30, 215, 96, 0.1) 100%); 
@@ -166,15 +412,15 @@ if st.session_state.df is not None:
                         box-shadow: 0 8px 32px rgba(29, 185, 84, 0.3);
                         margin-bottom: 2rem;">
                 <div style="display: flex; align-items: center; gap: 20px; margin-bottom: 15px;">
-                    <img src="{track['album_image']}" 
+                    <img src="{track.album_image}" 
                          alt="Album Art" 
                          style="width: 80px; 
                                 height: 80px; 
                                 border-radius: 12px; 
                                 box-shadow: 0 4px 15px rgba(0,0,0,0.5);">
                     <div>
-                        <h3 style="color: #1DB954; margin: 0; font-size: 1.3rem; font-weight: 700;">{track['name']}</h3>
-                        <p style="color: rgba(255, 255, 255, 0.8); margin: 5px 0 0 0; font-size: 1rem;">{track['artist']}</p>
+                        <h3 style="color: #1DB954; margin: 0; font-size: 1.3rem; font-weight: 700;">{track.name}</h3>
+                        <p style="color: rgba(255, 255, 255, 0.8); margin: 5px 0 0 0; font-size: 1rem;">{track.artist}</p>
                     </div>
                 </div>
                 <audio controls 
@@ -182,7 +428,7 @@ if st.session_state.df is not None:
                               margin-top: 10px;
                               border-radius: 25px;
                               filter: brightness(0.9) contrast(1.1);">
-                    <source src="{track['preview_url']}" type="audio/mpeg">
+                    <source src="{track.preview_url}" type="audio/mpeg">
                     Your browser does not support the audio element.
                 </audio>
                 <p style="color: #1DB954; 
@@ -194,7 +440,7 @@ if st.session_state.df is not None:
                 </p>
             </div>
             """
-            st.components.v1.html(player_html, height=200)
+            st.markdown(player_html, unsafe_allow_html=True)
             
         else:
             # Show Spotify embed when preview not available
@@ -218,11 +464,16 @@ if st.session_state.df is not None:
             
             # Show Spotify embed player
             st.markdown("### 🎵 Listen on Spotify")
-            embed_html = create_spotify_embed(track['id'])
+            embed_html = create_spotify_embed(track.id)
             st.components.v1.html(embed_html, height=180)
         
-        # Always show listening options
-        st.markdown("""
+        # Always show listening options (one markdown block)
+        links = [listen_link(track.external_url, '#1DB954 0%, #1ed760 100%', '29, 185, 84', '🎵', 'Spotify')]
+        if track.alternatives:
+            links.append(listen_link(track.alternatives['youtube_music'], '#FF0000 0%, #CC0000 100%', '255, 0, 0', '🎥', 'YouTube Music'))
+            links.append(listen_link(track.alternatives['youtube_search'], '#FF6B6B 0%, #FF5252 100%', '255, 107, 107', '▶️', 'YouTube'))
+        
+        st.markdown(f"""
             <div style="background: rgba(255, 255, 255, 0.03); 
                         border-radius: 15px; 
                         padding: 1.5rem; 
@@ -230,240 +481,60 @@ if st.session_state.df is not None:
                         border: 1px solid rgba(29, 185, 84, 0.2);
                         margin-top: 1.5rem;">
                 <h4 style="color: #1DB954; text-align: center; margin-bottom: 1rem;">🎵 Listen to Full Track</h4>
+                <div style="display: flex; gap: 1rem;">{''.join(links)}</div>
+            </div>
         """, unsafe_allow_html=True)
         
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown(f"""
-                <a href="{track['external_url']}" target="_blank" 
-                   style="display: block; 
-                          background: linear-gradient(135deg, #1DB954 0%, #1ed760 100%); 
-                          color: white; 
-                          text-decoration: none; 
-                          padding: 1rem; 
-                          border-radius: 12px; 
-                          text-align: center; 
-                          font-weight: 600;
-                          transition: transform 0.2s;
-                          box-shadow: 0 4px 15px rgba(29, 185, 84, 0.3);"
-                   onmouseover="this.style.transform='translateY(-3px)'"
-                   onmouseout="this.style.transform='translateY(0)'">
-                    <div style="font-size: 2rem; margin-bottom: 0.5rem;">🎵</div>
-                    <div>Spotify</div>
-                </a>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            if track.get('alternatives'):
-                st.markdown(f"""
-                    <a href="{track['alternatives']['youtube_music']}" target="_blank" 
-                       style="display: block; 
-                              background: linear-gradient(135deg, #FF0000 0%, #CC0000 100%); 
-                              color: white; 
-                              text-decoration: none; 
-                              padding: 1rem; 
-                              border-radius: 12px; 
-                              text-align: center; 
-                              font-weight: 600;
-                              transition: transform 0.2s;
-                              box-shadow: 0 4px 15px rgba(255, 0, 0, 0.3);"
-                       onmouseover="this.style.transform='translateY(-3px)'"
-                       onmouseout="this.style.transform='translateY(0)'">
-                        <div style="font-size: 2rem; margin-bottom: 0.5rem;">🎥</div>
-                        <div>YouTube Music</div>
-                    </a>
-                """, unsafe_allow_html=True)
-        
-        with col3:
-            if track.get('alternatives'):
-                st.markdown(f"""
-                    <a href="{track['alternatives']['youtube_search']}" target="_blank" 
-                       style="display: block; 
-                              background: linear-gradient(135deg, #FF6B6B 0%, #FF5252 100%); 
-                              color: white; 
-                              text-decoration: none; 
-                              padding: 1rem; 
-                              border-radius: 12px; 
-                              text-align: center; 
-                              font-weight: 600;
-                              transition: transform 0.2s;
-                              box-shadow: 0 4px 15px rgba(255, 107, 107, 0.3);"
-                       onmouseover="this.style.transform='translateY(-3px)'"
-                       onmouseout="this.style.transform='translateY(0)'">
-                        <div style="font-size: 2rem; margin-bottom: 0.5rem;">▶️</div>
-                        <div>YouTube</div>
-                    </a>
-                """, unsafe_allow_html=True)
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-        
         # Audio features visualization
-        if track.get('audio_features'):
-            features = track['audio_features']
+        if track.audio_features:
+            # Plotly is only needed once a track has been analyzed
+            import plotly.io as pio
+            
+            features = track.audio_features
             
             st.markdown('<div class="section-divider"><span>📊 Audio Features Analysis</span></div>', unsafe_allow_html=True)
             
-            # Feature cards grid
-            col1, col2, col3, col4 = st.columns(4)
+            # Feature cards grid (emitted as a single markdown block)
+            vals = [features[k] for k in FEATURE_KEYS]
             
-            feature_items = [
-                ('Danceability', features['danceability'], '💃'),
-                ('Energy', features['energy'], '⚡'),
-                ('Speechiness', features['speechiness'], '🗣️'),
-                ('Acousticness', features['acousticness'], '🎸'),
-                ('Instrumentalness', features['instrumentalness'], '🎹'),
-                ('Liveness', features['liveness'], '🎤'),
-                ('Valence', features['valence'], '😊'),
-                ('Tempo', features['tempo'], '🥁')
+            html_parts = [
+                f'<div class="feature-card">'
+                f'<div class="feature-icon">{icon}</div>'
+                f'<div class="feature-name">{name}</div>'
+                f'<div class="feature-value">{f"{value:.0f} BPM" if name == "Tempo" else f"{value:.1f}%"}</div>'
+                f'</div>'
+                for name, value, icon in zip(FEATURE_LABELS, vals, FEATURE_ICONS)
             ]
-            
-            cols = [col1, col2, col3, col4]
-            for idx, (name, value, icon) in enumerate(feature_items):
-                with cols[idx % 4]:
-                    if name == 'Tempo':
-                        st.markdown(f"""
-                            <div class="feature-card">
-                                <div class="feature-icon">{icon}</div>
-                                <div class="feature-name">{name}</div>
-                                <div class="feature-value">{value:.0f} BPM</div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown(f"""
-                            <div class="feature-card">
-                                <div class="feature-icon">{icon}</div>
-                                <div class="feature-name">{name}</div>
-                                <div class="feature-value">{value:.1f}%</div>
-                            </div>
-                        """, unsafe_allow_html=True)
+            st.markdown('<div class="feature-grid">' + ''.join(html_parts) + '</div>', unsafe_allow_html=True)
             
             st.markdown("<br>", unsafe_allow_html=True)
             
+            # Figures are memoized per track
+            bar_json, radar_json = build_figs(track.id, tuple(vals))
+            
             # Bar chart for audio features
             st.markdown("### 📊 Feature Distribution")
-            feature_names = ['Danceability', 'Energy', 'Speechiness', 'Acousticness', 
-                           'Instrumentalness', 'Liveness', 'Valence']
-            feature_values = [features['danceability'], features['energy'], features['speechiness'],
-                            features['acousticness'], features['instrumentalness'], 
-                            features['liveness'], features['valence']]
-            
-            fig_bar = go.Figure(data=[
-                go.Bar(
-                    x=feature_names,
-                    y=feature_values,
-                    marker=dict(
-                        color=feature_values,
-                        colorscale=[[0, '#0a4d2e'], [0.5, '#1DB954'], [1, '#1ed760']],
-                        line=dict(color='#1DB954', width=2)
-                    ),
-                    text=[f'{v:.1f}%' for v in feature_values],
-                    textposition='outside',
-                    textfont=dict(color='white', size=14, family='Poppins')
-                )
-            ])
-            
-            fig_bar.update_layout(
-                plot_bgcolor='rgba(10, 14, 39, 0.5)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='white', family='Poppins'),
-                yaxis=dict(
-                    range=[0, 110], 
-                    title=dict(text='Percentage (%)', font=dict(size=14)),
-                    gridcolor='rgba(255,255,255,0.1)',
-                    tickfont=dict(size=12)
-                ),
-                xaxis=dict(
-                    title=dict(text='', font=dict(size=14)),
-                    tickfont=dict(size=12)
-                ),
-                height=450,
-                margin=dict(t=40, b=60, l=60, r=40),
-                showlegend=False
-            )
-            
-            st.plotly_chart(fig_bar, use_container_width=True, key="bar_chart")
+            st.plotly_chart(pio.from_json(bar_json), use_container_width=True, key="bar_chart")
             
             # Radar chart and Tempo Gauge
             col1, col2 = st.columns(2)
             
             with col1:
                 st.markdown("### 🎯 Audio Profile Radar")
-                fig_radar = go.Figure()
-                
-                fig_radar.add_trace(go.Scatterpolar(
-                    r=feature_values,
-                    theta=feature_names,
-                    fill='toself',
-                    fillcolor='rgba(29, 185, 84, 0.4)',
-                    line=dict(color='#1DB954', width=3),
-                    name='Audio Features',
-                    marker=dict(size=8, color='#1ed760')
-                ))
-                
-                fig_radar.update_layout(
-                    polar=dict(
-                        bgcolor='rgba(10, 14, 39, 0.5)',
-                        radialaxis=dict(
-                            visible=True,
-                            range=[0, 100],
-                            gridcolor='rgba(255,255,255,0.2)',
-                            tickfont=dict(color='white', size=11, family='Poppins'),
-                            ticksuffix='%'
-                        ),
-                        angularaxis=dict(
-                            gridcolor='rgba(255,255,255,0.2)',
-                            tickfont=dict(color='white', size=12, family='Poppins', weight='bold')
-                        )
-                    ),
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white', family='Poppins'),
-                    height=450,
-                    margin=dict(t=60, b=60, l=60, r=60),
-                    showlegend=False
-                )
-                
-                st.plotly_chart(fig_radar, use_container_width=True, key="radar_chart")
+                st.plotly_chart(pio.from_json(radar_json), use_container_width=True, key="radar_chart")
             
             with col2:
                 st.markdown("### 🎼 Tempo Gauge")
-                fig_gauge = go.Figure(go.Indicator(
-                    mode="gauge+number+delta",
-                    value=features['tempo'],
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    title={'text': "Beats Per Minute", 'font': {'color': 'white', 'size': 20, 'family': 'Poppins'}},
-                    number={'font': {'color': '#1DB954', 'size': 56, 'family': 'Poppins', 'weight': 'bold'}, 'suffix': ' BPM'},
-                    delta={'reference': 120, 'increasing': {'color': "#1ed760"}, 'decreasing': {'color': "#1DB954"}},
-                    gauge={
-                        'axis': {'range': [0, 200], 'tickcolor': 'white', 'tickfont': {'size': 12, 'family': 'Poppins'}},
-                        'bar': {'color': '#1DB954', 'thickness': 0.7},
-                        'bgcolor': 'rgba(10, 14, 39, 0.5)',
-                        'borderwidth': 3,
-                        'bordercolor': '#1DB954',
-                        'steps': [
-                            {'range': [0, 60], 'color': 'rgba(29, 185, 84, 0.15)'},
-                            {'range': [60, 120], 'color': 'rgba(29, 185, 84, 0.25)'},
-                            {'range': [120, 180], 'color': 'rgba(29, 185, 84, 0.35)'},
-                            {'range': [180, 200], 'color': 'rgba(29, 185, 84, 0.45)'}
-                        ],
-                        'threshold': {
-                            'line': {'color': "#1ed760", 'width': 5},
-                            'thickness': 0.8,
-                            'value': features['tempo']
-                        }
-                    }
-                ))
-                
-                fig_gauge.update_layout(
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='white', family='Poppins'),
-                    height=450,
-                    margin=dict(t=80, b=60, l=40, r=40)
-                )
-                
-                st.plotly_chart(fig_gauge, use_container_width=True, key="tempo_gauge")
+                st.markdown(tempo_gauge(features['tempo']), unsafe_allow_html=True)
         else:
             st.warning("⚠️ Audio features not available for this track.")
+
+# Main analysis section
+if st.session_state.df is not None:
+    df = st.session_state.df
+    df_key = st.session_state.df_key
+    
+    track_panel(df, df_key)
     
     # Dataset preview
     st.markdown('<div class="section-divider"><span>📋 Dataset Preview</span></div>', unsafe_allow_html=True)
@@ -473,7 +544,7 @@ if st.session_state.df is not None:
     """, unsafe_allow_html=True)
     
     st.dataframe(
-        df.head(20),
+        dataset_preview(df, df_key),
         use_container_width=True,
         height=400
     )
@@ -483,6 +554,7 @@ if st.session_state.df is not None:
     # Dataset statistics
     st.markdown('<div class="section-divider"><span>📈 Dataset Statistics</span></div>', unsafe_allow_html=True)
     
+    stats = dataset_stats(df, df_key)
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
@@ -490,7 +562,7 @@ if st.session_state.df is not None:
             <div class="stat-card">
                 <div class="stat-icon">🎵</div>
                 <div class="stat-label">Total Tracks</div>
-                <div class="stat-value">{len(df)}</div>
+                <div class="stat-value">{stats['n']}</div>
             </div>
         """, unsafe_allow_html=True)
     
@@ -499,13 +571,13 @@ if st.session_state.df is not None:
             <div class="stat-card">
                 <div class="stat-icon">🎤</div>
                 <div class="stat-label">Unique Artists</div>
-                <div class="stat-value">{df['artist'].nunique()}</div>
+                <div class="stat-value">{stats['artists']}</div>
             </div>
         """, unsafe_allow_html=True)
     
     with col3:
-        if 'popularity' in df.columns:
-            avg_popularity = df['popularity'].mean()
+        if stats['pop'] is not None:
+            avg_popularity = stats['pop']
             st.markdown(f"""
                 <div class="stat-card">
                     <div class="stat-icon">⭐</div>
@@ -519,7 +591,7 @@ if st.session_state.df is not None:
             <div class="stat-card">
                 <div class="stat-icon">💿</div>
                 <div class="stat-label">Unique Albums</div>
-                <div class="stat-value">{df['album'].nunique() if 'album' in df.columns else 'N/A'}</div>
+                <div class="stat-value">{stats['albums'] if stats['albums'] is not None else 'N/A'}</div>
             </div>
         """, unsafe_allow_html=True)
 
@@ -1,8 +1,13 @@
 import streamlit as st
 import pandas as pd
 
+@st.cache_data(ttl="24h", max_entries=8)
+def load_csv(path):
+    """Load a CSV dataset from disk"""
+    return pd.read_csv(path)
+
 # Load the dataset
-df = pd.read_csv('dataset.csv')
+df = load_csv('dataset.csv')
 
 # Display the dataset in a fully scrollable table
 st.title("Dataset Display")
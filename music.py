@@ -1,175 +1,544 @@
 # music.py
 import spotipy
+from spotipy.exceptions import SpotifyException
 from spotipy.oauth2 import SpotifyClientCredentials
+import functools
 import logging
+import os
+import shelve
+import types
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import quote
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+except ImportError:  # optional, faster JSON decoding
+    orjson = None
+
+try:
+    from dotenv import load_dotenv
+except ImportError:  # optional; without it the variables must be exported
+    load_dotenv = None
+
+# Module logger; handlers and levels are left to the application
 logger = logging.getLogger(__name__)
 
-# Spotify API credentials
-CLIENT_ID = "ADD YOUR CLIENT_ID HERE"
-CLIENT_SECRET = "ADD YOUR CLIENT_SECRET HERE"
+# Spotify API credentials, read once from the environment; .env is loaded first
+# when python-dotenv is installed (already exported variables take precedence)
+if load_dotenv:
+    load_dotenv()
+CLIENT_ID = os.environ.get("SPOTIFY_CLIENT_ID")
+CLIENT_SECRET = os.environ.get("SPOTIFY_CLIENT_SECRET")
+
+# Audio features reported as 0-1 by Spotify and shown as percentages
+_SCALED_KEYS = ('danceability', 'energy', 'speechiness', 'acousticness',
+                'instrumentalness', 'liveness', 'valence')
+# Features passed through as-is, with their fallback values
+_RAW_FEATURE_DEFAULTS = types.MappingProxyType({
+    'tempo': 120,
+    'loudness': -5,
+    'key': 0,
+    'mode': 1,
+    'time_signature': 4
+})
+# Used when Spotify has no features for a track or the request fails
+_DEFAULT_AUDIO_FEATURES = types.MappingProxyType({
+    'danceability': 50,
+    'energy': 50,
+    'speechiness': 10,
+    'acousticness': 30,
+    'instrumentalness': 20,
+    'liveness': 15,
+    'valence': 50,
+    **_RAW_FEATURE_DEFAULTS
+})
+
+class _LRUCache:
+    """
+    Minimal LRU cache with optional per-entry expiry (ttl in seconds)
+    Not thread-safe on its own; all access goes through _cache_lock
+    """
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def _expired(self, key):
+        """Drop the entry if it has outlived the ttl"""
+        expires, _ = self._data[key]
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            return True
+        return False
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data and not self._expired(key)
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._data.move_to_end(key)
+        return self._data[key][1]
+
+    def __setitem__(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def update(self, items):
+        for key, value in items.items():
+            self[key] = value
+
+    def clear(self):
+        self._data.clear()
+
+# Process-local result caches: search results expire, audio features never change
+_search_cache = _LRUCache(maxsize=4096, ttl=600)
+_features_cache = _LRUCache(maxsize=10000)
+_cache_lock = threading.Lock()
+# Audio features are also persisted so restarts don't lose them
+AUDIO_FEATURES_DB = os.path.join('.cache', 'audio_features')
+# Serializes access to the on-disk store; separate from _cache_lock so disk I/O
+# never blocks memory cache lookups
+_store_lock = threading.Lock()
+
+# Long-lived worker threads for concurrent Spotify requests; together with the
+# pooled session this keeps threads and HTTPS connections warm between lookups
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='spotify')
+
+# Speculative audio features fetches in flight, by track ID
+_pending_features = {}
+
+class _OrjsonSession(requests.Session):
+    """
+    requests session whose responses decode JSON with orjson
+    orjson errors subclass ValueError, which is what spotipy expects from .json()
+    """
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        response.json = lambda **_: orjson.loads(response.content)
+        return response
+
+# Guards first-time creation of the shared client
+_client_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _build_spotify_client():
+    """
+    Build the Spotify client once; its token and keep-alive connections are reused
+    The credentials manager caches the access token, so it must not be rebuilt per call
+    """
+    auth_manager = SpotifyClientCredentials(
+        client_id=CLIENT_ID,
+        client_secret=CLIENT_SECRET
+    )
+    session = _OrjsonSession() if orjson else requests.Session()
+    # A custom session skips spotipy's own retry setup, so connection and read
+    # errors are retried here; HTTP 429/5xx are left to _with_backoff
+    retry = Retry(total=3, connect=3, read=3, status=0, backoff_factor=0.3)
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+    sp = spotipy.Spotify(
+        auth_manager=auth_manager,
+        requests_session=session
+    )
+    logger.info("Spotify client initialized successfully")
+    return sp
 
 # Initialize Spotify client
 def initialize_spotify_client():
     """
     Initialize and return Spotify client with credentials
+    The client is cached, so repeated calls share one token and connection pool
     """
     try:
-        auth_manager = SpotifyClientCredentials(
-            client_id=CLIENT_ID,
-            client_secret=CLIENT_SECRET
-        )
-        sp = spotipy.Spotify(auth_manager=auth_manager)
-        logger.info("Spotify client initialized successfully")
-        return sp
+        with _client_lock:
+            return _build_spotify_client()
     except Exception as e:
-        logger.error(f"Error initializing Spotify client: {e}")
+        logger.error("Error initializing Spotify client: %s", e)
         return None
 
-def search_track_with_preview(sp, track_name, artist_name):
+# HTTP statuses worth retrying: rate limiting and transient server errors
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def _with_backoff(max_tries=5, base_delay=0.5, max_delay=8.0):
+    """
+    Retry a Spotify call on 429/5xx errors
+    Waits for Retry-After on 429 when given, otherwise backs off exponentially
+    A Retry-After longer than max_delay is not waited out; the error is raised
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_tries + 1):
+                try:
+                    return func(*args, **kwargs)
+                except SpotifyException as e:
+                    if e.http_status not in _RETRY_STATUSES or attempt == max_tries:
+                        raise
+                    delay = min(base_delay * 2 ** (attempt - 1), max_delay)
+                    retry_after = (e.headers or {}).get('Retry-After')
+                    if e.http_status == 429 and retry_after:
+                        try:
+                            retry_after = float(retry_after)
+                        except ValueError:
+                            pass
+                        else:
+                            # Spotify can ask for hours; don't tie up the shared workers that long
+                            if retry_after > max_delay:
+                                raise
+                            delay = retry_after
+                    logger.warning("Spotify returned %s, retrying in %.1fs", e.http_status, delay)
+                    time.sleep(delay)
+        return wrapper
+    return decorator
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: bursts of up to `capacity` calls, refilled at `rate` per second
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Proactive throttling for every outbound Spotify call: 10 requests/s, 2 in flight
+_rate_limiter = _TokenBucket(rate=10, capacity=10)
+_in_flight = threading.BoundedSemaphore(2)
+
+def _rate_limited(func):
+    """Apply the shared rate limit and concurrency cap to a Spotify call"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _rate_limiter.acquire()
+        with _in_flight:
+            return func(*args, **kwargs)
+    return wrapper
+
+@_with_backoff()
+@_rate_limited
+def _search(sp, query):
+    """Run a single track search"""
+    logger.debug("Searching with query: %s", query)
+    return sp.search(q=query, type='track', limit=5, market='US')
+
+@_with_backoff()
+@_rate_limited
+def _features(sp, track_ids):
+    """Fetch raw audio features for up to 100 tracks"""
+    return sp.audio_features(track_ids)
+
+def invalidate():
+    """
+    Clear the search and audio features caches, including the on-disk store
+    Fetches already in flight are forgotten rather than reused
+    """
+    with _cache_lock:
+        _search_cache.clear()
+        _features_cache.clear()
+        _pending_features.clear()
+    try:
+        with _store_lock, shelve.open(AUDIO_FEATURES_DB) as db:
+            db.clear()
+    except Exception as e:
+        logger.warning("Could not clear audio features store: %s", e)
+
+def search_track_with_preview(sp, track_name, artist_name, fallback=False):
     """
     Search for a track on Spotify with multiple attempts to find preview
+    Only track + artist queries are tried; pass fallback=True to also try a
+    fuzzy track-name-only search when those miss
+    Results are cached for 10 minutes per (track, artist); misses are not cached
+    """
+    key = (track_name.casefold().strip(), artist_name.casefold().strip(), fallback)
+    with _cache_lock:
+        track_info = _search_cache.get(key)
+    if track_info is None:
+        track_info = _search_track(sp, track_name, artist_name, fallback)
+        if track_info:
+            with _cache_lock:
+                _search_cache[key] = track_info
+    # Callers fill in fields on the result, so never hand out the cached object
+    return replace(track_info) if track_info else None
+
+def _search_track(sp, track_name, artist_name, fallback=False):
+    """
+    Uncached search behind search_track_with_preview
+    The fallback queries are sent concurrently on the shared executor but
+    their results are still checked in order; every query is normally sent
+    even when the first one matches, trading API calls for latency
     """
+    futures = []
     try:
         # Try different search strategies
         search_queries = [
             f'track:"{track_name}" artist:"{artist_name}"',
             f'{track_name} {artist_name}',
-            f'{track_name}',
         ]
+        if fallback:
+            # Popularity-sorted noise that rarely contains the right artist
+            search_queries.append(f'{track_name}')
+        futures = [_executor.submit(_search, sp, query) for query in search_queries]
         
-        for query in search_queries:
-            logger.info(f"Searching with query: {query}")
-            results = sp.search(q=query, type='track', limit=10, market='US')
+        # Case-insensitive matching; casefold also handles names like Björk or Motörhead
+        track_name_cf = track_name.casefold()
+        artist_name_cf = artist_name.casefold()
+        
+        for future in futures:
+            results = future.result()
             
             if results['tracks']['items']:
-                # First, try to find exact match with preview
-                for track in results['tracks']['items']:
-                    artist_match = any(artist_name.lower() in artist['name'].lower() 
-                                     for artist in track['artists'])
-                    track_match = track_name.lower() in track['name'].lower()
-                    
-                    if artist_match and track_match and track['preview_url']:
-                        logger.info(f"Found exact match with preview: {track['name']}")
-                        return create_track_info(track)
+                # The winner is one of these; fetch features for all of them
+                # (one request) while the results are ranked
+                _prefetch_audio_features(sp, [track['id'] for track in results['tracks']['items']])
                 
-                # Then try any track with preview from results
+                # Single pass: an exact match with preview (score 3) beats any
+                # track with preview (1), which beats the first result (0)
+                best, best_score = None, -1
                 for track in results['tracks']['items']:
-                    if track['preview_url']:
-                        logger.info(f"Found track with preview: {track['name']}")
-                        return create_track_info(track)
+                    has_preview = bool(track['preview_url'])
+                    # Cheapest checks first; any() stops at the first matching artist
+                    exact_match = (has_preview
+                                   and track_name_cf in track['name'].casefold()
+                                   and any(artist_name_cf in artist['name'].casefold()
+                                           for artist in track['artists']))
+                    score = 2 * exact_match + has_preview
+                    if score > best_score:
+                        best, best_score = track, score
+                        if score == 3:
+                            break
                 
-                # If no preview found, return first result
-                track = results['tracks']['items'][0]
-                logger.warning(f"No preview available, returning: {track['name']}")
-                return create_track_info(track)
+                if best_score == 3:
+                    logger.debug("Found exact match with preview: %s", best['name'])
+                elif best_score == 1:
+                    logger.debug("Found track with preview: %s", best['name'])
+                else:
+                    logger.warning("No preview available, returning: %s", best['name'])
+                return create_track_info(best)
         
         return None
     except Exception as e:
-        logger.error(f"Error in search_track_with_preview: {e}")
+        logger.error("Error in search_track_with_preview: %s", e)
         return None
+    finally:
+        # Only skips queries still queued behind busy workers; with idle
+        # workers they have all started and still count against the rate limit
+        for future in futures:
+            future.cancel()
+
+@dataclass(slots=True)
+class TrackInfo:
+    """
+    Standardized track info; audio_features and alternatives are filled in by get_track_preview
+    """
+    id: str
+    name: str
+    artist: str
+    album: str
+    album_image: str | None
+    preview_url: str | None
+    popularity: int
+    release_date: str
+    duration_ms: int
+    external_url: str
+    uri: str
+    audio_features: dict | None = None
+    alternatives: dict | None = None
 
 def create_track_info(track):
     """
-    Create standardized track info dictionary
-    """
-    return {
-        'id': track['id'],
-        'name': track['name'],
-        'artist': track['artists'][0]['name'],
-        'album': track['album']['name'],
-        'album_image': track['album']['images'][0]['url'] if track['album']['images'] else None,
-        'preview_url': track['preview_url'],
-        'popularity': track['popularity'],
-        'release_date': track['album']['release_date'],
-        'duration_ms': track['duration_ms'],
-        'external_url': track['external_urls']['spotify'],
-        'uri': track['uri']
-    }
+    Create standardized track info from a Spotify track object
+    """
+    return TrackInfo(
+        id=track['id'],
+        name=track['name'],
+        artist=track['artists'][0]['name'],
+        album=track['album']['name'],
+        album_image=track['album']['images'][0]['url'] if track['album']['images'] else None,
+        preview_url=track['preview_url'],
+        popularity=track['popularity'],
+        release_date=track['album']['release_date'],
+        duration_ms=track['duration_ms'],
+        external_url=track['external_urls']['spotify'],
+        uri=track['uri']
+    )
 
 def get_alternative_preview_url(track_name, artist_name):
     """
     Generate alternative preview sources
     """
+    # Encode the shared "track artist" query once
+    query = quote(f'{track_name} {artist_name}')
     alternatives = {
-        'youtube_search': f"https://www.youtube.com/results?search_query={quote(track_name + ' ' + artist_name + ' audio')}",
-        'youtube_music': f"https://music.youtube.com/search?q={quote(track_name + ' ' + artist_name)}",
-        'soundcloud': f"https://soundcloud.com/search?q={quote(track_name + ' ' + artist_name)}",
+        'youtube_search': f"https://www.youtube.com/results?search_query={query}%20audio",
+        'youtube_music': f"https://music.youtube.com/search?q={query}",
+        'soundcloud': f"https://soundcloud.com/search?q={query}",
     }
     return alternatives
 
+def get_audio_features_bulk(sp, track_ids):
+    """
+    Get audio features for many tracks, up to 100 IDs per request
+    Returns a dict mapping each track ID to its features (defaults when unavailable)
+    Features are served from the memory cache or on-disk store when possible
+    """
+    audio_features = _cached_audio_features(track_ids, disk=False)
+    missing = [track_id for track_id in dict.fromkeys(track_ids) if track_id not in audio_features]
+    
+    # Reuse speculative fetches that are already in flight
+    with _cache_lock:
+        pending = {_pending_features[track_id] for track_id in missing if track_id in _pending_features}
+    for future in pending:
+        audio_features.update((track_id, features) for track_id, features in future.result().items()
+                              if track_id in missing)
+    missing = [track_id for track_id in missing if track_id not in audio_features]
+    
+    # Only open the on-disk store for what's still missing
+    if missing:
+        audio_features.update(_cached_audio_features(missing))
+        missing = [track_id for track_id in missing if track_id not in audio_features]
+    
+    audio_features.update(_fetch_audio_features(sp, missing))
+    # Copies, so callers never mutate cached entries or the shared defaults
+    return {track_id: dict(features) for track_id, features in audio_features.items()}
+
+def _prefetch_audio_features(sp, track_ids):
+    """
+    Start fetching audio features in the background for uncached tracks
+    get_audio_features_bulk waits for these instead of fetching them again
+    """
+    cached = _cached_audio_features(track_ids)
+    missing = [track_id for track_id in track_ids if track_id not in cached]
+    if not missing:
+        return
+    future = _executor.submit(_fetch_audio_features, sp, missing)
+    with _cache_lock:
+        for track_id in missing:
+            _pending_features.setdefault(track_id, future)
+    
+    def _done(_):
+        with _cache_lock:
+            for track_id in missing:
+                if _pending_features.get(track_id) is future:
+                    del _pending_features[track_id]
+    future.add_done_callback(_done)
+
+def _fetch_audio_features(sp, track_ids):
+    """
+    Fetch audio features from Spotify in chunks of 100 and cache the results
+    """
+    audio_features = {}
+    fetched = {}
+    for start in range(0, len(track_ids), 100):
+        chunk = track_ids[start:start + 100]
+        try:
+            logger.debug("Fetching audio features for %d track(s)", len(chunk))
+            features = _features(sp, chunk) or [None] * len(chunk)
+            
+            for track_id, audio_data in zip(chunk, features):
+                if audio_data:
+                    features_by_key = {key: audio_data.get(key, 0) * 100 for key in _SCALED_KEYS}
+                    for key, default in _RAW_FEATURE_DEFAULTS.items():
+                        features_by_key[key] = audio_data.get(key, default)
+                    audio_features[track_id] = fetched[track_id] = features_by_key
+                else:
+                    # Default values if no features available
+                    logger.warning("No audio features found for %s, using defaults", track_id)
+                    audio_features[track_id] = _DEFAULT_AUDIO_FEATURES
+        except Exception as e:
+            logger.error("Error getting audio features: %s", e)
+            # Default values for the whole chunk
+            for track_id in chunk:
+                audio_features[track_id] = _DEFAULT_AUDIO_FEATURES
+    # Defaults are not cached, so failed lookups are retried next time
+    _store_audio_features(fetched)
+    return audio_features
+
+def _cached_audio_features(track_ids, disk=True):
+    """
+    Look up audio features in the memory cache, then (unless disk=False) in the on-disk store
+    """
+    found = {}
+    with _cache_lock:
+        for track_id in track_ids:
+            if track_id in _features_cache:
+                found[track_id] = _features_cache[track_id]
+    missing = [track_id for track_id in track_ids if track_id not in found]
+    if disk and missing and os.path.exists(os.path.dirname(AUDIO_FEATURES_DB)):
+        from_disk = {}
+        try:
+            with _store_lock, shelve.open(AUDIO_FEATURES_DB) as db:
+                for track_id in missing:
+                    if track_id in db:
+                        from_disk[track_id] = db[track_id]
+        except Exception as e:
+            logger.warning("Could not read audio features store: %s", e)
+        if from_disk:
+            with _cache_lock:
+                _features_cache.update(from_disk)
+            found.update(from_disk)
+    return found
+
+def _store_audio_features(features_by_id):
+    """
+    Save fetched audio features to the memory cache and the on-disk store
+    """
+    if not features_by_id:
+        return
+    with _cache_lock:
+        _features_cache.update(features_by_id)
+    try:
+        os.makedirs(os.path.dirname(AUDIO_FEATURES_DB), exist_ok=True)
+        with _store_lock, shelve.open(AUDIO_FEATURES_DB) as db:
+            db.update(features_by_id)
+    except Exception as e:
+        logger.warning("Could not write audio features store: %s", e)
+
 def get_audio_features(sp, track_id):
     """
     Get audio features for a track
     Returns features like danceability, energy, tempo, etc.
     """
-    try:
-        logger.info(f"Fetching audio features for track ID: {track_id}")
-        features = sp.audio_features(track_id)
-        
-        if features and features[0]:
-            audio_data = features[0]
-            logger.info("Audio features retrieved successfully")
-            return {
-                'danceability': audio_data.get('danceability', 0) * 100,
-                'energy': audio_data.get('energy', 0) * 100,
-                'speechiness': audio_data.get('speechiness', 0) * 100,
-                'acousticness': audio_data.get('acousticness', 0) * 100,
-                'instrumentalness': audio_data.get('instrumentalness', 0) * 100,
-                'liveness': audio_data.get('liveness', 0) * 100,
-                'valence': audio_data.get('valence', 0) * 100,
-                'tempo': audio_data.get('tempo', 120),
-                'loudness': audio_data.get('loudness', -5),
-                'key': audio_data.get('key', 0),
-                'mode': audio_data.get('mode', 1),
-                'time_signature': audio_data.get('time_signature', 4)
-            }
-        
-        # Return default values if no features available
-        logger.warning("No audio features found, using defaults")
-        return {
-            'danceability': 50,
-            'energy': 50,
-            'speechiness': 10,
-            'acousticness': 30,
-            'instrumentalness': 20,
-            'liveness': 15,
-            'valence': 50,
-            'tempo': 120,
-            'loudness': -5,
-            'key': 0,
-            'mode': 1,
-            'time_signature': 4
-        }
-    except Exception as e:
-        logger.error(f"Error getting audio features: {e}")
-        # Return default values
-        return {
-            'danceability': 50,
-            'energy': 50,
-            'speechiness': 10,
-            'acousticness': 30,
-            'instrumentalness': 20,
-            'liveness': 15,
-            'valence': 50,
-            'tempo': 120,
-            'loudness': -5,
-            'key': 0,
-            'mode': 1,
-            'time_signature': 4
-        }
-
-def get_track_preview(track_name, artist_name):
+    return get_audio_features_bulk(sp, [track_id])[track_id]
+
+def get_track_preview(track_name, artist_name, sp=None):
     """
     Main function to get track preview URL and all information
     Returns complete track data including preview_url for playback
+    An existing Spotify client can be passed in to reuse its token and connections
     """
     try:
-        sp = initialize_spotify_client()
+        if sp is None:
+            sp = initialize_spotify_client()
         if not sp:
             return None, "Failed to initialize Spotify client. Please check your credentials."
         
@@ -178,25 +547,24 @@ def get_track_preview(track_name, artist_name):
             return None, f"Track '{track_name}' by '{artist_name}' not found on Spotify."
         
         # Get audio features (always, even if preview not available)
-        audio_features = get_audio_features(sp, track_info['id'])
-        track_info['audio_features'] = audio_features
-        logger.info("Complete track data retrieved")
+        audio_features = get_audio_features(sp, track_info.id)
+        track_info.audio_features = audio_features
+        logger.debug("Complete track data retrieved")
         
         # Get alternative preview sources
-        track_info['alternatives'] = get_alternative_preview_url(track_name, artist_name)
+        track_info.alternatives = get_alternative_preview_url(track_name, artist_name)
         
-        if not track_info['preview_url']:
+        if not track_info.preview_url:
             return track_info, "Spotify preview not available. Alternative listening options provided below."
         
         return track_info, None
         
     except Exception as e:
-        logger.error(f"Error in get_track_preview: {e}")
+        logger.error("Error in get_track_preview: %s", e)
         return None, f"An error occurred: {str(e)}"
 
-def create_spotify_embed(track_id):
-    """Create Spotify embed HTML for a given track ID"""
-    embed_html = f"""
+# Spotify embed player markup, filled in per track
+_EMBED_TEMPLATE = """
     <iframe src="https://open.spotify.com/embed/track/{track_id}" 
             width="100%" 
             height="152" 
@@ -208,4 +576,6 @@ def create_spotify_embed(track_id):
     </iframe>
     """
 
-    return embed_html
+def create_spotify_embed(track_id):
+    """Create Spotify embed HTML for a given track ID"""
+    return _EMBED_TEMPLATE.format(track_id=track_id)